@@ -0,0 +1,36 @@
+-- Create a lookup of the distinct combinations of overlapping designations and
+-- restrictions present in designations_planarized
+DROP TABLE IF EXISTS designation_combination;
+
+CREATE TABLE designation_combination AS
+SELECT
+  row_number() OVER (ORDER BY process_order, source_id)::integer AS combination_id,
+  process_order,
+  designation,
+  source_id,
+  source_name,
+  forest_restrictions,
+  mine_restrictions,
+  og_restrictions,
+  forest_restriction_max,
+  mine_restriction_max,
+  og_restriction_max
+FROM
+(
+  SELECT DISTINCT
+    process_order,
+    designation,
+    source_id,
+    source_name,
+    forest_restrictions,
+    mine_restrictions,
+    og_restrictions,
+    forest_restriction_max,
+    mine_restriction_max,
+    og_restriction_max
+  FROM designations_planarized
+) AS combinations;
+
+ALTER TABLE designation_combination ADD PRIMARY KEY (combination_id);
+
+ANALYZE designation_combination;
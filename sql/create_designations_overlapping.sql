@@ -13,7 +13,7 @@
 
 -- ----------------------------------------------------------------------------------------------------
 
---   - merge/repair data in src_table
+--   - merge/repair data in (tiled) src_table, for tiles matching supplied pattern
 --   - where available, retain source id and source name
 
 -- insert cleaned data plus restriction columns
@@ -41,7 +41,8 @@ SELECT
   $mine_restriction as mine_restriction,
   b.map_tile,
   -- make sure the output is valid
-  ST_Safe_Repair(
+  -- ($repair is empty for normalized sources, which are known to be valid)
+  $repair(
   -- dump
     (ST_Dump(
   -- merge records with the same name and id
@@ -60,8 +61,13 @@ SELECT
           )
       )
       )).geom) as geom
+-- source is pre-tiled, only compare to boundary in the same tile
 FROM $src_table a
 INNER JOIN bc_boundary b
-ON ST_Intersects(a.geom, b.geom)
+ON a.map_tile = b.map_tile AND ST_Intersects(a.geom, b.geom)
 WHERE b.bc_boundary = 'bc_boundary_land'
-GROUP BY designation, designation_id, designation_name, map_tile;
\ No newline at end of file
+AND a.map_tile LIKE %s
+-- filter both tables on the partition key (map sheet) for partition pruning
+AND substring(a.map_tile from 1 for 4) = substring(%s from 1 for 4)
+AND substring(b.map_tile from 1 for 4) = substring(%s from 1 for 4)
+GROUP BY designation, designation_id, designation_name, b.map_tile;
\ No newline at end of file
@@ -6,12 +6,15 @@ WITH src AS
     geom
   FROM designations_overlapping
   WHERE map_tile LIKE %s
+  -- filter on the partition key (map sheet) for partition pruning
+  AND substring(map_tile from 1 for 4) = substring(%s from 1 for 4)
   UNION ALL
   SELECT
     map_tile,
     geom
   FROM bc_boundary_land_tiled
   WHERE map_tile LIKE %s
+  AND substring(map_tile from 1 for 4) = substring(%s from 1 for 4)
 ),
 
 -- dump poly rings and convert to lines
@@ -38,30 +41,47 @@ flattened AS
 (
   SELECT
     map_tile,
-    (ST_Dump(ST_Polygonize(geom))).geom AS geom
-  FROM lines
-  GROUP BY map_tile
+    row_number() OVER () AS face_id,
+    geom
+  FROM
+  (
+    SELECT
+      map_tile,
+      (ST_Dump(ST_Polygonize(geom))).geom AS geom
+    FROM lines
+    GROUP BY map_tile
+  ) AS faces
 ),
 
--- get the attributes and sort by process_order
-sorted AS
+-- get the attributes of the designations covering each face, aggregated by face id
+-- (faces are created from the designations of the same tile, only these are joined).
+-- ST_Polygonize does not keep the provenance of the linework, so this remains a
+-- point in polygon join against the tile's designations
+attributes AS
 (
   SELECT
-    d.process_order,
-    d.designation,
-    d.source_id,
-    d.source_name,
-    COALESCE(d.forest_restriction, 0) as forest_restriction,
-    COALESCE(d.mine_restriction, 0) as mine_restriction,
-    COALESCE(d.og_restriction, 0) as og_restriction,
-    f.map_tile,
-    f.geom
+    f.face_id,
+    array_agg(d.process_order ORDER BY d.process_order, d.source_id) as process_order,
+    array_agg(d.designation ORDER BY d.process_order, d.source_id) as designation,
+    array_agg(d.source_id ORDER BY d.process_order, d.source_id) as source_id,
+    array_agg(d.source_name ORDER BY d.process_order, d.source_id) as source_name,
+    array_agg(COALESCE(d.forest_restriction, 0) ORDER BY d.process_order, d.source_id) as forest_restrictions,
+    array_agg(COALESCE(d.mine_restriction, 0) ORDER BY d.process_order, d.source_id) as mine_restrictions,
+    array_agg(COALESCE(d.og_restriction, 0) ORDER BY d.process_order, d.source_id) as og_restrictions,
+    max(COALESCE(d.forest_restriction, 0)) as forest_restriction_max,
+    max(COALESCE(d.mine_restriction, 0)) as mine_restriction_max,
+    max(COALESCE(d.og_restriction, 0)) as og_restriction_max
   FROM flattened f
   LEFT OUTER JOIN designations_overlapping d
-  ON ST_Contains(d.geom, ST_PointOnSurface(f.geom))
-  ORDER BY d.process_order, d.source_id
-)
+  ON d.map_tile = f.map_tile
+  AND substring(d.map_tile from 1 for 4) = substring(%s from 1 for 4)
+  AND ST_Contains(d.geom, ST_PointOnSurface(f.geom))
+  GROUP BY f.face_id
+),
 
+-- insert the planarized features, returning what is needed for qa
+planarized AS
+(
 INSERT INTO designations_planarized (
   process_order,
   designation,
@@ -77,17 +97,50 @@ INSERT INTO designations_planarized (
   geom
 )
 SELECT
-  array_agg(process_order ORDER BY process_order) as process_order,
-  array_agg(designation ORDER BY process_order) as designation,
-  array_agg(source_id ORDER BY process_order) as source_id,
-  array_agg(source_name ORDER BY process_order) as source_name,
-  array_agg(forest_restriction ORDER BY process_order) as forest_restrictions,
-  array_agg(mine_restriction ORDER BY process_order) as mine_restrictions,
-  array_agg(og_restriction ORDER BY process_order) as og_restrictions,
-  (sort_desc(array_agg(forest_restriction)))[1] as forest_restriction_max,
-  (sort_desc(array_agg(mine_restriction)))[1] as mine_restriction_max,
-  (sort_desc(array_agg(og_restriction)))[1] as og_restriction_max,
+  a.process_order,
+  a.designation,
+  a.source_id,
+  a.source_name,
+  a.forest_restrictions,
+  a.mine_restrictions,
+  a.og_restrictions,
+  a.forest_restriction_max,
+  a.mine_restriction_max,
+  a.og_restriction_max,
+  f.map_tile,
+  f.geom
+FROM flattened f
+INNER JOIN attributes a ON f.face_id = a.face_id
+RETURNING
+  designation,
+  forest_restriction_max,
+  mine_restriction_max,
+  og_restriction_max,
   map_tile,
-  geom
-FROM sorted
-GROUP BY map_tile, geom;
+  ST_Area(geom) AS area
+)
+
+-- accumulate area by designation combination / restriction levels for the tile,
+-- qa.sql rolls these up rather than re-scanning designations_planarized
+INSERT INTO qa_planarized_tiles (
+  map_tile,
+  designation,
+  forest_restriction_max,
+  mine_restriction_max,
+  og_restriction_max,
+  area
+)
+SELECT
+  map_tile,
+  designation,
+  forest_restriction_max,
+  mine_restriction_max,
+  og_restriction_max,
+  SUM(area) AS area
+FROM planarized
+GROUP BY
+  map_tile,
+  designation,
+  forest_restriction_max,
+  mine_restriction_max,
+  og_restriction_max;
@@ -0,0 +1,20 @@
+-- Present designations_planarized_compact in the shape of the (non-compact)
+-- designations_planarized table
+CREATE OR REPLACE VIEW designations_planarized AS
+SELECT
+  p.designations_planarized_id,
+  c.process_order,
+  c.designation,
+  c.source_id,
+  c.source_name,
+  c.forest_restrictions,
+  c.mine_restrictions,
+  c.og_restrictions,
+  c.forest_restriction_max,
+  c.mine_restriction_max,
+  c.og_restriction_max,
+  p.map_tile,
+  p.geom
+FROM designations_planarized_compact p
+INNER JOIN designation_combination c
+ON p.combination_id = c.combination_id;
@@ -0,0 +1,69 @@
+-- Compare a tile of designations_planarized with the same tile of a previous
+-- run ($previous schema), recording the area added and removed for each
+-- designation and each restriction level
+
+-- union the polygons of each designation / restriction level
+WITH current_levels AS
+(
+  SELECT
+    p.map_tile,
+    k.kind,
+    k.value,
+    ST_Union(p.geom) AS geom
+  FROM designations_planarized p
+  CROSS JOIN LATERAL (
+    SELECT 'designation' AS kind, d AS value FROM unnest(p.designation) AS d
+    UNION ALL
+    VALUES
+      ('forest_restriction', p.forest_restriction_max::text),
+      ('mine_restriction', p.mine_restriction_max::text),
+      ('og_restriction', p.og_restriction_max::text)
+  ) AS k
+  WHERE p.map_tile LIKE %s
+  -- filter on the partition key (map sheet) for partition pruning
+  AND substring(p.map_tile from 1 for 4) = substring(%s from 1 for 4)
+  AND k.value IS NOT NULL
+  GROUP BY p.map_tile, k.kind, k.value
+),
+
+previous_levels AS
+(
+  SELECT
+    p.map_tile,
+    k.kind,
+    k.value,
+    ST_Union(p.geom) AS geom
+  FROM $previous.designations_planarized p
+  CROSS JOIN LATERAL (
+    SELECT 'designation' AS kind, d AS value FROM unnest(p.designation) AS d
+    UNION ALL
+    VALUES
+      ('forest_restriction', p.forest_restriction_max::text),
+      ('mine_restriction', p.mine_restriction_max::text),
+      ('og_restriction', p.og_restriction_max::text)
+  ) AS k
+  WHERE p.map_tile LIKE %s
+  AND k.value IS NOT NULL
+  GROUP BY p.map_tile, k.kind, k.value
+)
+
+INSERT INTO planarized_diff (map_tile, kind, value, area_added, area_removed)
+SELECT
+  coalesce(c.map_tile, p.map_tile) AS map_tile,
+  coalesce(c.kind, p.kind) AS kind,
+  coalesce(c.value, p.value) AS value,
+  CASE
+    WHEN p.geom IS NULL THEN ST_Area(c.geom)
+    WHEN c.geom IS NULL THEN 0
+    ELSE ST_Area(ST_Safe_Difference(c.geom, p.geom))
+  END AS area_added,
+  CASE
+    WHEN c.geom IS NULL THEN ST_Area(p.geom)
+    WHEN p.geom IS NULL THEN 0
+    ELSE ST_Area(ST_Safe_Difference(p.geom, c.geom))
+  END AS area_removed
+FROM current_levels c
+FULL OUTER JOIN previous_levels p
+ON c.map_tile = p.map_tile
+AND c.kind = p.kind
+AND c.value = p.value;
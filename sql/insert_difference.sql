@@ -25,10 +25,14 @@ src_clip AS
    geom
  FROM $in_table
  WHERE map_tile LIKE %s
+ -- filter on the partition key (map sheet) for partition pruning
+ AND substring(map_tile from 1 for 4) = substring(%s from 1 for 4)
  $query),
 
 dest_clip AS
-(SELECT * FROM $out_table WHERE map_tile LIKE %s),
+(SELECT * FROM $out_table
+ WHERE map_tile LIKE %s
+ AND substring(map_tile from 1 for 4) = substring(%s from 1 for 4)),
 
 all_intersects AS
 (SELECT
@@ -0,0 +1,25 @@
+-- Copy a map sheet of designations_planarized to designations_planarized_compact,
+-- replacing the designation and restriction arrays with a reference to
+-- the matching row of designation_combination
+INSERT INTO designations_planarized_compact (
+  designations_planarized_id,
+  combination_id,
+  map_tile,
+  geom
+)
+SELECT
+  p.designations_planarized_id,
+  c.combination_id,
+  p.map_tile,
+  p.geom
+FROM designations_planarized p
+INNER JOIN designation_combination c
+-- (arrays containing nulls compare as equal)
+ON p.process_order = c.process_order
+AND p.designation = c.designation
+AND p.source_id = c.source_id
+AND p.source_name = c.source_name
+AND p.forest_restrictions = c.forest_restrictions
+AND p.mine_restrictions = c.mine_restrictions
+AND p.og_restrictions = c.og_restrictions
+WHERE substring(p.map_tile from 1 for 4) = substring(%s from 1 for 4);
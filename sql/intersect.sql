@@ -14,8 +14,8 @@
 -- ----------------------------------------------------------------------------------------------------
 
 -- overlay (intersect) two tables for given tile
-
-INSERT INTO $out_table ($columns_a, $columns_b, geom)
+-- table_a is tiled (has a map_tile column), read the tile slice directly
+-- (the caller inserts the result into a table or selects from it)
 
 WITH
 
@@ -27,17 +27,11 @@ tile AS
 
 tile_a AS
 (
-  SELECT $columns_a,
-    CASE
-      WHEN ST_CoveredBy(ST_CollectionExtract(a.geom, 3), ST_CollectionExtract(tile.geom, 3)) THEN ST_MakeValid(a.geom)
-      ELSE ST_CollectionExtract(
-               ST_Intersection(
-                    ST_MakeValid(
-                        ST_SnapToGrid(
-                             ST_Buffer(a.geom, 0), 0.001)), tile.geom),  3)
-    END as geom
+  SELECT $columns_a, a.geom
   FROM $table_a a
-  INNER JOIN tile ON ST_Intersects(ST_CollectionExtract(a.geom, 3), ST_CollectionExtract(tile.geom, 3))
+  WHERE a.map_tile LIKE %s
+  -- filter on the partition key (map sheet) for partition pruning
+  AND substring(a.map_tile from 1 for 4) = substring(%s from 1 for 4)
 ),
 
 tile_b AS
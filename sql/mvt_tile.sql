@@ -0,0 +1,35 @@
+-- Create a Mapbox Vector Tile of designations_planarized for tile z/x/y
+-- Returns:
+--   - the tile (null if no features are visible at this zoom level)
+--   - count of features intersecting the tile (if zero, the tile's children
+--     are also empty)
+WITH bounds AS
+(
+  SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+),
+
+features AS
+(
+  SELECT
+    $attributes,
+    -- simplify in Web Mercator, the units of the tolerance
+    ST_AsMVTGeom(
+      ST_Simplify(ST_Transform(p.geom, 3857), %s),
+      b.geom,
+      4096,
+      64
+    ) AS geom
+  FROM designations_planarized p
+  CROSS JOIN bounds b
+  -- (segmentize the tile edges before transforming to BC Albers)
+  WHERE p.geom && ST_Transform(
+    ST_Segmentize(b.geom, (ST_XMax(b.geom) - ST_XMin(b.geom)) / 16),
+    3005
+  )
+)
+
+SELECT
+  ST_AsMVT(f, 'designations_planarized', 4096, 'geom')
+    FILTER (WHERE f.geom IS NOT NULL),
+  count(*)
+FROM features f;
@@ -0,0 +1,59 @@
+-- Copyright 2017 Province of British Columbia
+--
+-- Licensed under the Apache License, Version 2.0 (the "License");
+-- you may not use this file except in compliance with the License.
+-- You may obtain a copy of the License at
+--
+-- http://www.apache.org/licenses/LICENSE-2.0
+--
+-- Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an "AS IS" BASIS,
+-- WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+--
+-- See the License for the specific language governing permissions and limitations under the License.
+
+-- ----------------------------------------------------------------------------------------------------
+
+-- Create a normalized copy of a source table, so that downstream per-tile
+-- queries do not have to repeatedly repair the same geometries:
+--   - snap to a fixed precision grid
+--   - make valid, retaining only polygons
+--   - subdivide oversized polygons
+--   - record validity of the result
+
+CREATE TABLE $out_table AS
+
+WITH snapped AS
+(
+  SELECT
+    $columns,
+    ST_SnapToGrid(geom, $grid_size) AS geom
+  FROM $src_table
+),
+
+repaired AS
+(
+  SELECT
+    $columns,
+    CASE
+      WHEN ST_IsValid(geom) THEN geom
+      ELSE ST_CollectionExtract(ST_MakeValid(geom), 3)
+    END AS geom
+  FROM snapped
+),
+
+subdivided AS
+(
+  SELECT
+    $columns,
+    ST_Subdivide(geom, $max_vertices) AS geom
+  FROM repaired
+  WHERE NOT ST_IsEmpty(geom)
+)
+
+SELECT
+  $columns,
+  geom,
+  ST_IsValid(geom) AS geom_valid
+FROM subdivided;
+
+CREATE INDEX ON $out_table USING GIST (geom);
@@ -1,5 +1,9 @@
 -- run a few basic area comparisons to check that outputs make sense
 
+-- Areas of designations_planarized are not calculated here - the planarization
+-- workers accumulate area by designation combination and restriction levels for
+-- each tile into qa_planarized_tiles as they insert. These queries roll up
+-- that (small) table rather than scanning designations_planarized.
 
 -- first, compare total designation area in the _overlaps and _planarized tables
 -- these are expected to be similar - but not equal. This is because overlaps within
@@ -22,8 +26,8 @@ ORDER BY designation
 distinct_combinations AS
 (SELECT
  designation,
- SUM(st_area(geom)) / 10000 as area_ha_planarized
-FROM designations_planarized
+ SUM(area) / 10000 as area_ha_planarized
+FROM qa_planarized_tiles
 GROUP BY designation
 ORDER BY designation)
 
@@ -43,6 +47,44 @@ GROUP BY o.designation, o.area_ha;
 -- (these should be very close to equal)
 DROP TABLE IF EXISTS qa_summary;
 CREATE TABLE qa_summary AS
+
+-- one row per restriction type / level, in output order
+WITH restriction_types (type_order, restriction, label) AS
+(
+  VALUES
+    (0, 'forest', 'Forest'),
+    (1, 'mine', 'Mine'),
+    (2, 'og', 'Oil and Gas')
+),
+
+restriction_levels (level, label) AS
+(
+  VALUES
+    (5, 'protected'),
+    (4, 'full'),
+    (3, 'high'),
+    (2, 'medium'),
+    (1, 'low'),
+    (0, 'none')
+),
+
+-- unpivot the max restriction columns and sum area by type and level
+restriction_areas AS
+(
+  SELECT
+    r.restriction,
+    r.level,
+    SUM(q.area) AS area
+  FROM qa_planarized_tiles q
+  CROSS JOIN LATERAL (
+    VALUES
+      ('forest', q.forest_restriction_max),
+      ('mine', q.mine_restriction_max),
+      ('og', q.og_restriction_max)
+  ) AS r (restriction, level)
+  GROUP BY r.restriction, r.level
+)
+
 SELECT * FROM
 (SELECT
    1 as row,
@@ -53,134 +95,18 @@ UNION ALL
 SELECT
   2 as row,
   'Total area, designations_planarized' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-UNION ALL
-SELECT
-3 as row,
-  'Forest restricted, protected' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE forest_restriction_max = 5
-UNION ALL
-SELECT
-4 as row,
-  'Forest restricted, full' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE forest_restriction_max = 4
-UNION ALL
-SELECT
-5 as row,
-  'Forest restricted, high' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE forest_restriction_max = 3
-UNION ALL
-SELECT
-6 as row,
-  'Forest restricted, medium' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE forest_restriction_max = 2
-UNION ALL
-SELECT
-7 as row,
-  'Forest restricted, low' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE forest_restriction_max = 1
-UNION ALL
-SELECT
-8 as row,
-  'Forest restricted, none' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE forest_restriction_max = 0
-UNION ALL
-SELECT
-9 as row,
-  'Mine restricted, protected' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE mine_restriction_max = 5
-UNION ALL
-SELECT
-10 as row,
-  'Mine restricted, full' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE mine_restriction_max = 4
-UNION ALL
-SELECT
-11 as row,
-  'Mine restricted, high' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE mine_restriction_max = 3
-UNION ALL
-SELECT
-12 as row,
-  'Mine restricted, medium' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE mine_restriction_max = 2
-UNION ALL
-SELECT
-13 as row,
-  'Mine restricted, low' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE mine_restriction_max = 1
-UNION ALL
-SELECT
-14 as row,
-  'Mine restricted, none' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE mine_restriction_max = 0
-UNION ALL
-SELECT
-15 as row,
-  'Oil and Gas restricted, protected' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE og_restriction_max = 5
-UNION ALL
-SELECT
-16 as row,
-  'Oil and Gas restricted, full' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE og_restriction_max = 4
-UNION ALL
-SELECT
-17 as row,
-  'Oil and Gas restricted, high' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE og_restriction_max = 3
-UNION ALL
-SELECT
-18 as row,
-  'Oil and Gas restricted, medium' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE og_restriction_max = 2
-UNION ALL
-SELECT
-19 as row,
-  'Oil and Gas restricted, low' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE og_restriction_max = 1
-UNION ALL
-SELECT
-20 as row,
-  'Oil and Gas restricted, none' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
-WHERE og_restriction_max = 0
+  ROUND((SUM(area) / 10000)::numeric) AS area_ha
+FROM qa_planarized_tiles
+UNION ALL
+SELECT
+  3 + t.type_order * 6 + (5 - l.level) as row,
+  t.label || ' restricted, ' || l.label as description,
+  ROUND((a.area / 10000)::numeric) AS area_ha
+FROM restriction_types t
+CROSS JOIN restriction_levels l
+LEFT OUTER JOIN restriction_areas a
+ON t.restriction = a.restriction
+AND l.level = a.level
 ) as t
 order by row;
 
@@ -191,8 +117,9 @@ DROP TABLE IF EXISTS qa_total_check;
 CREATE TABLE qa_total_check AS
 SELECT
   'Area total: designations_planarized' as description,
-  ROUND((SUM(ST_Area(geom)) / 10000)::numeric) AS area_ha
-FROM designations_planarized
+  area_ha
+FROM qa_summary
+WHERE description = 'Total area, designations_planarized'
 UNION ALL
 SELECT
 'Area total: forest restrictions' as description,
@@ -210,4 +137,4 @@ SELECT
 'Area total: oil and gas restrictions' as description,
   sum(area_ha)
 FROM qa_summary
-WHERE description LIKE 'Oil%%';
\ No newline at end of file
+WHERE description LIKE 'Oil%%';
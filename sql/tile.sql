@@ -13,17 +13,9 @@
 
 -- ----------------------------------------------------------------------------------------------------
 
---   Create output table and insert merge/repaired data in src_table, tiling the output
+--   Insert merge/repaired data in src_table into (existing) out_table, tiling the output
 --   Note that the only attribute retained is 'designation'
 
--- create empty table with new auto-indexed id column
-CREATE TABLE IF NOT EXISTS $out_table (
-     id serial PRIMARY KEY,
-     designation text,
-     map_tile text,
-     geom geometry
-);
-
 -- insert cleaned and tiled data
 INSERT INTO $out_table (designation, map_tile, geom)
   SELECT designation, map_tile, geom
@@ -51,7 +43,3 @@ INSERT INTO $out_table (designation, map_tile, geom)
         FROM $src_table a
         INNER JOIN tiles b ON ST_Intersects(a.geom, b.geom)
         GROUP BY designation, map_tile) AS foo;
-
--- index for speed
-CREATE INDEX ON $out_table USING GIST (geom);
-CREATE INDEX ON $out_table (map_tile text_pattern_ops);
@@ -0,0 +1,27 @@
+-- Fingerprint the content of designations_planarized for the supplied tiles.
+-- Each polygon is hashed (attributes and geometry), the hashes are aggregated
+-- in sorted order so the result does not depend on row order or ids
+SELECT
+  map_tile,
+  md5(string_agg(row_hash, '' ORDER BY row_hash)) AS fingerprint
+FROM
+(
+  SELECT
+    map_tile,
+    md5(
+      concat_ws(
+        '|',
+        process_order::text,
+        designation::text,
+        source_id::text,
+        source_name::text,
+        forest_restrictions::text,
+        mine_restrictions::text,
+        og_restrictions::text,
+        md5(ST_AsBinary(geom))
+      )
+    ) AS row_hash
+  FROM designations_planarized
+  WHERE map_tile = ANY(%s)
+) AS hashes
+GROUP BY map_tile;
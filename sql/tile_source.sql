@@ -0,0 +1,42 @@
+-- Copyright 2017 Province of British Columbia
+--
+-- Licensed under the Apache License, Version 2.0 (the "License");
+-- you may not use this file except in compliance with the License.
+-- You may obtain a copy of the License at
+--
+-- http://www.apache.org/licenses/LICENSE-2.0
+--
+-- Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an "AS IS" BASIS,
+-- WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+--
+-- See the License for the specific language governing permissions and limitations under the License.
+
+-- ----------------------------------------------------------------------------------------------------
+
+-- Cut a source table to the tiles matching the supplied map_tile pattern,
+-- inserting singlepart polygons into a tiled copy of the source.
+-- Sources are normalized to the same precision grid (GRID_SIZE): polygons within
+-- a tile are copied unchanged, and intersections at a fixed precision are
+-- always valid, so the validity recorded when normalizing still holds
+
+INSERT INTO $out_table ($columns, map_tile, geom)
+
+SELECT
+  $columns,
+  map_tile,
+  (ST_Dump(geom)).geom AS geom
+FROM
+(
+  SELECT
+    $src_columns,
+    t.map_tile,
+    CASE
+      WHEN ST_CoveredBy(a.geom, t.geom) THEN a.geom
+      ELSE ST_CollectionExtract(ST_Intersection(a.geom, t.geom, $grid_size), 3)
+    END AS geom
+  FROM $src_table a
+  INNER JOIN tiles t
+  ON ST_Intersects(a.geom, t.geom)
+  WHERE t.map_tile LIKE %s
+) AS f
+WHERE NOT ST_IsEmpty(geom);
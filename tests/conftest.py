@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    """
+    Return a function writing a config file with the repository's sources
+    plus the provided lines, returning its path
+    """
+
+    def write(text=""):
+        config_file = tmp_path / "designatedlands.cfg"
+        config_file.write_text(
+            "[designatedlands]\n"
+            f"sources_designations = {ROOT}/sources_designations.csv\n"
+            f"sources_supporting = {ROOT}/sources_supporting.csv\n" + text
+        )
+        return str(config_file)
+
+    return write
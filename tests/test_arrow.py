@@ -0,0 +1,60 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from designatedlands import arrow_batch, arrow_type  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "sql_type, expected",
+    [
+        ("integer", pa.int32()),
+        ("bigint", pa.int64()),
+        ("double precision", pa.float64()),
+        ("boolean", pa.bool_()),
+        ("text", pa.string()),
+        ("character varying(254)", pa.string()),
+        ("date", pa.date32()),
+        ("geometry(MultiPolygon,3005)", pa.binary()),
+        ("integer[]", pa.list_(pa.int32())),
+        ("text[]", pa.list_(pa.string())),
+    ],
+)
+def test_arrow_type(sql_type, expected):
+    assert arrow_type(sql_type) == expected
+
+
+def test_arrow_type_unknown():
+    with pytest.raises(KeyError):
+        arrow_type("interval")
+
+
+SCHEMA = pa.schema(
+    [
+        ("process_order", pa.list_(pa.int32())),
+        ("designation", pa.string()),
+        ("forest_restriction_max", pa.int32()),
+        ("geom", pa.binary()),
+    ]
+)
+
+
+def test_arrow_batch():
+    rows = [
+        ([1, 2], "park", 4, memoryview(b"\x01\x03")),
+        ([None], None, 0, None),
+    ]
+    batch = arrow_batch(rows, SCHEMA)
+    assert batch.schema == SCHEMA
+    assert batch.to_pydict() == {
+        "process_order": [[1, 2], [None]],
+        "designation": ["park", None],
+        "forest_restriction_max": [4, 0],
+        "geom": [b"\x01\x03", None],
+    }
+
+
+def test_arrow_batch_empty():
+    batch = arrow_batch([], SCHEMA)
+    assert batch.num_rows == 0
+    assert batch.schema == SCHEMA
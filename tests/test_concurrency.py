@@ -0,0 +1,114 @@
+import pytest
+
+import designatedlands
+from designatedlands import ConcurrencyController
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Result(object):
+    def __init__(self, row):
+        self.row = row
+
+    def fetchone(self):
+        return self.row
+
+
+class ActivityDB(object):
+    """Stand in for the database, reporting (active, waiting) sessions"""
+
+    def __init__(self, active, waiting):
+        self.row = (active, waiting)
+
+    def query(self, sql, params=None):
+        assert "pg_stat_activity" in sql
+        return Result(self.row)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(designatedlands.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def idle_host(monkeypatch):
+    # no memory information and no load on the client
+    monkeypatch.setattr(designatedlands.os.path, "exists", lambda path: False)
+    monkeypatch.setattr(designatedlands.os, "getloadavg", lambda: (0.0, 0.0, 0.0))
+
+
+def run_interval(controller, clock, n_completed, seconds=10):
+    clock.now += seconds
+    controller.update(n_completed)
+
+
+def test_starts_midway(clock):
+    assert ConcurrencyController(None, 1, 8).limit == 5
+    assert ConcurrencyController(None, 2, 2).limit == 2
+
+
+def test_waits_for_interval(clock, idle_host):
+    controller = ConcurrencyController(None, 1, 8)
+    clock.now = 5
+    controller.update(100)
+    assert controller.limit == 5
+
+
+def test_hill_climbing(clock, idle_host):
+    controller = ConcurrencyController(None, 1, 8)
+    # first interval steps up, as does improving throughput
+    run_interval(controller, clock, 10)
+    assert controller.limit == 6
+    run_interval(controller, clock, 20)
+    assert controller.limit == 7
+    # lower throughput reverses the direction
+    run_interval(controller, clock, 15)
+    assert controller.limit == 6
+    run_interval(controller, clock, 30)
+    assert controller.limit == 5
+
+
+def test_limit_bounded(clock, idle_host):
+    controller = ConcurrencyController(None, 2, 3)
+    for n in range(1, 6):
+        run_interval(controller, clock, n * 10)
+    assert controller.limit == 3
+    controller.overloaded = lambda: True
+    for n in range(5):
+        run_interval(controller, clock, 10)
+    assert controller.limit == 2
+
+
+def test_overloaded_steps_down(clock):
+    controller = ConcurrencyController(None, 1, 8)
+    controller.overloaded = lambda: True
+    run_interval(controller, clock, 10)
+    assert controller.limit == 4
+
+
+def test_lock_contention(idle_host):
+    assert ConcurrencyController(ActivityDB(4, 3), 1, 8).overloaded()
+    assert not ConcurrencyController(ActivityDB(4, 2), 1, 8).overloaded()
+    assert not ConcurrencyController(ActivityDB(0, 0), 1, 8).overloaded()
+
+
+def test_no_db(idle_host):
+    assert not ConcurrencyController(None, 1, 8).overloaded()
+
+
+def test_client_load(monkeypatch):
+    monkeypatch.setattr(designatedlands.os.path, "exists", lambda path: False)
+    monkeypatch.setattr(
+        designatedlands.os,
+        "getloadavg",
+        lambda: (2.0 * designatedlands.multiprocessing.cpu_count(), 0.0, 0.0),
+    )
+    assert ConcurrencyController(None, 1, 8).overloaded()
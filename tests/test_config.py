@@ -0,0 +1,60 @@
+import pytest
+
+from designatedlands import ConfigValueError, DesignatedLands
+
+
+@pytest.fixture
+def load(write_config):
+    return lambda text: DesignatedLands(write_config(text))
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(ConfigValueError):
+        DesignatedLands(str(tmp_path / "missing.cfg"))
+
+
+def test_values_converted(load):
+    dl = load(
+        "n_processes = 1\n"
+        "adaptive_concurrency = true\n"
+        "min_processes = 1\n"
+        "memory_budget = 2048\n"
+        "max_work_mem = 256\n"
+        "pyramid_resolutions = 20,50,\n"
+        "[concurrency]\n"
+        "tile_sources = 1,4\n",
+    )
+    assert dl.config["adaptive_concurrency"] is True
+    assert dl.config["memory_budget"] == 2048
+    assert dl.config["max_work_mem"] == 256
+    assert dl.config["pyramid_resolutions"] == [20, 50]
+    assert dl.config["concurrency"] == {"tile_sources": (1, 4)}
+
+
+def test_min_processes_within_n_processes(load):
+    for min_processes in [0, 4]:
+        dl = load(f"n_processes = 1\nmin_processes = {min_processes}\n")
+        assert dl.config["min_processes"] == 1
+
+
+@pytest.mark.parametrize("bounds", ["4", "1,2,3", "a,b"])
+def test_concurrency_malformed(load, bounds):
+    with pytest.raises(ConfigValueError, match="must be <min>,<max>"):
+        load(f"[concurrency]\ntile_sources = {bounds}\n")
+
+
+@pytest.mark.parametrize("bounds", ["0,4", "4,2"])
+def test_concurrency_invalid(load, bounds):
+    with pytest.raises(ConfigValueError, match="bounds"):
+        load(f"[concurrency]\ntile_sources = {bounds}\n")
+
+
+def test_pyramid_resolution_not_multiple(load):
+    with pytest.raises(ConfigValueError, match="not a multiple"):
+        load("pyramid_resolutions = 25\n")
+
+
+def test_pyramid_resolutions_band(load):
+    # 130 and 170 cells have a common multiple greater than a raster band
+    with pytest.raises(ConfigValueError, match="common multiple"):
+        load("pyramid_resolutions = 1300,1700\n")
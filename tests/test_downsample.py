@@ -0,0 +1,39 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from designatedlands import downsample  # noqa: E402
+
+
+def test_max():
+    array = np.array(
+        [[1, 2, 0, 0], [3, 255, 0, 255], [255, 255, 4, 4], [255, 255, 4, 1]],
+        dtype="uint8",
+    )
+    assert downsample(array, 2, "max").tolist() == [[3, 0], [255, 4]]
+
+
+def test_priority_most_common():
+    array = np.array([[5, 5], [5, 2]], dtype="uint8")
+    assert downsample(array, 2, "priority").tolist() == [[5]]
+
+
+def test_priority_tie_lowest_process_order():
+    array = np.array([[7, 7], [3, 3]], dtype="uint8")
+    assert downsample(array, 2, "priority").tolist() == [[3]]
+
+
+def test_priority_tie_no_designation_last():
+    array = np.array([[0, 0], [9, 9]], dtype="uint8")
+    assert downsample(array, 2, "priority").tolist() == [[9]]
+
+
+def test_priority_ignores_nodata():
+    array = np.array([[255, 255], [255, 4]], dtype="uint8")
+    assert downsample(array, 2, "priority").tolist() == [[4]]
+
+
+def test_partial_blocks_padded():
+    array = np.array([[1, 1, 2], [1, 1, 2], [3, 3, 255]], dtype="uint8")
+    result = downsample(array, 2, "priority")
+    assert result.tolist() == [[1, 2], [3, 255]]
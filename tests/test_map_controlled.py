@@ -0,0 +1,133 @@
+import pytest
+
+import designatedlands
+from designatedlands import DesignatedLands
+
+
+class FakeResult(object):
+    """A job that is finished once it has been polled twice"""
+
+    def __init__(self, pool, job, value):
+        self.pool = pool
+        self.job = job
+        self.value = value
+        self.polls = 0
+
+    def ready(self):
+        self.polls += 1
+        if self.polls < 2:
+            return False
+        self.pool.running.discard(self.job)
+        return True
+
+    def get(self):
+        return self.value
+
+
+class FakePool(object):
+    """
+    Stand in for multiprocessing.Pool, running jobs when submitted and
+    recording the submissions and the jobs running at the time
+    """
+
+    instances = []
+
+    def __init__(self, processes):
+        self.processes = processes
+        self.submitted = []
+        self.running = set()
+        FakePool.instances.append(self)
+
+    def apply_async(self, func, args, kwds=None):
+        job = args[0]
+        self.submitted.append((job, kwds, sorted(self.running)))
+        self.running.add(job)
+        return FakeResult(self, job, func(*args, **(kwds or {})))
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def run_job(job, settings=None):
+    return job
+
+
+@pytest.fixture
+def dl(write_config, monkeypatch):
+    FakePool.instances = []
+    monkeypatch.setattr(designatedlands.multiprocessing, "Pool", FakePool)
+    monkeypatch.setattr(designatedlands.time, "sleep", lambda seconds: None)
+    dl = DesignatedLands(write_config())
+    dl.config["n_processes"] = 8
+    return dl
+
+
+COSTS = {"a": 60, "b": 50, "c": 30, "d": 10, "e": 200}
+
+
+def test_admission_order(dl):
+    dl.config["memory_budget"] = 100
+    results = dl.map_controlled(run_job, list(COSTS), progress=False, costs=COSTS)
+    assert sorted(results) == sorted(COSTS)
+    (pool,) = FakePool.instances
+    # the largest job fitting in the remaining budget is admitted next,
+    # a job over the budget runs once nothing else is running
+    assert [job for job, _, _ in pool.submitted] == ["a", "c", "d", "b", "e"]
+    assert [running for _, _, running in pool.submitted] == [
+        [],
+        ["a"],
+        ["a", "c"],
+        [],
+        [],
+    ]
+
+
+def test_budget_respected(dl):
+    dl.config["memory_budget"] = 100
+    costs = {f"t{i}": 10 * (i % 7) for i in range(30)}
+    dl.map_controlled(run_job, list(costs), progress=False, costs=costs)
+    (pool,) = FakePool.instances
+    for job, _, running in pool.submitted:
+        charged = [max(costs[j], designatedlands.MIN_WORK_MEM) for j in running + [job]]
+        assert sum(charged) <= 100
+
+
+def test_work_mem(dl):
+    dl.config["memory_budget"] = 100
+    dl.config["max_work_mem"] = 40
+    dl.map_controlled(run_job, list(COSTS), progress=False, costs=COSTS)
+    (pool,) = FakePool.instances
+    work_mem = {job: kwds["settings"]["work_mem"] for job, kwds, _ in pool.submitted}
+    # a quarter of the cost, within MIN_WORK_MEM and max_work_mem
+    assert work_mem == {
+        "a": "15MB",
+        "b": "12MB",
+        "c": "7MB",
+        "d": "4MB",
+        "e": "40MB",
+    }
+
+
+def test_without_costs_in_order_within_processes(dl):
+    dl.config["n_processes"] = 2
+    jobs = list(range(6))
+    results = dl.map_controlled(run_job, jobs, progress=False)
+    (pool,) = FakePool.instances
+    assert pool.processes == 2
+    assert [job for job, _, _ in pool.submitted] == jobs
+    assert all(kwds is None for _, kwds, _ in pool.submitted)
+    assert all(len(running) < 2 for _, _, running in pool.submitted)
+    assert sorted(results) == jobs
+
+
+def test_adaptive_stage_bounds(dl):
+    dl.config["adaptive_concurrency"] = True
+    dl.config["concurrency"] = {"tile_sources": (1, 1)}
+    jobs = list(range(4))
+    dl.map_controlled(run_job, jobs, progress=False, stage="tile_sources", local=True)
+    (pool,) = FakePool.instances
+    assert pool.processes == 1
+    assert all(not running for _, _, running in pool.submitted)
@@ -0,0 +1,70 @@
+import pytest
+
+geopandas = pytest.importorskip("geopandas")
+shapely = pytest.importorskip("shapely")
+from shapely.geometry import box  # noqa: E402
+
+from designatedlands import planarize_tile  # noqa: E402
+
+
+def designations():
+    return geopandas.GeoDataFrame(
+        {
+            "process_order": [1, 2],
+            "designation": ["park", "wha"],
+            "source_id": [10, 20],
+            "source_name": ["Park A", "WHA B"],
+            "forest_restriction": [4, 2],
+            "mine_restriction": [3, 0],
+            "og_restriction": [1, 2],
+        },
+        geometry=[box(0, 0, 60, 100), box(40, 0, 100, 100)],
+        crs="EPSG:3005",
+    )
+
+
+def planarize():
+    return planarize_tile(("092B001", designations(), [box(0, 0, 120, 100)]))
+
+
+def faces():
+    """Return the planarized faces, keyed by their designations"""
+    return {tuple(row.designation): row for row in planarize().itertuples()}
+
+
+def test_faces_cover_land_without_overlap():
+    result = planarize()
+    assert len(result) == 4
+    assert result.geometry.area.sum() == pytest.approx(12000)
+    assert shapely.union_all(result.geometry.values).area == pytest.approx(12000)
+    assert (result.map_tile == "092B001").all()
+
+
+def test_overlap_attributes_ordered_by_process_order():
+    face = faces()
+    overlap = face[("park", "wha")]
+    assert overlap.geometry.area == pytest.approx(2000)
+    assert overlap.process_order == [1, 2]
+    assert overlap.source_id == [10, 20]
+    assert all(type(v) is int for v in overlap.source_id)
+    assert overlap.forest_restrictions == [4, 2]
+    assert overlap.forest_restriction_max == 4
+    assert overlap.mine_restriction_max == 3
+    assert overlap.og_restriction_max == 2
+
+
+def test_single_designations():
+    face = faces()
+    assert face[("park",)].geometry.area == pytest.approx(4000)
+    assert face[("wha",)].geometry.area == pytest.approx(4000)
+    assert face[("wha",)].source_name == ["WHA B"]
+
+
+def test_land_without_designation():
+    face = faces()
+    land = face[(None,)]
+    assert land.geometry.area == pytest.approx(2000)
+    assert land.process_order == [None]
+    assert land.source_id == [None]
+    assert land.source_name == [None]
+    assert land.forest_restriction_max == 0
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+rasterio = pytest.importorskip("rasterio")
+
+from designatedlands import DesignatedLands  # noqa: E402
+
+
+@pytest.fixture
+def dl(tmp_path, write_config):
+    """
+    DesignatedLands with output rasters of 2100 x 20 cells (spanning three
+    query blocks), each raster's value at row, col being (row + col + i) % 200
+    """
+    dl = DesignatedLands(write_config(f"out_path = {tmp_path}\n"))
+    dl.bounds = [1000000, 500000, 1021000, 500200]
+    profile = dict(dl.raster_profile, driver="GTiff", dtype="uint8")
+    rows, cols = np.indices((profile["height"], profile["width"]))
+    for i, raster in enumerate(dl.raster_lookups()):
+        with rasterio.open(tmp_path / f"{raster}.tif", "w", **profile) as dst:
+            dst.write(((rows + cols + i) % 200).astype("uint8"), 1)
+    return dl
+
+
+def test_values(dl):
+    # cells (row 0, col 0), (row 19, col 2099), (row 5, col 1024), (row 1, col 3)
+    x = [1000001, 1020999, 1010245, 1000035]
+    y = [500199, 500001, 500145, 500185]
+    results = dl.query_points(x, y)
+    assert list(results) == list(dl.raster_lookups())
+    for i, raster in enumerate(results):
+        expected = [(v + i) % 200 for v in (0, 2118, 1029, 4)]
+        assert results[raster].tolist() == expected
+
+
+def test_outside_is_nodata(dl):
+    results = dl.query_points([999999, 1000001, 1021001], [500100, 500201, 500100])
+    for values in results.values():
+        assert values.tolist() == [255, 255, 255]
+
+
+def test_no_points(dl):
+    for values in dl.query_points([], []).values():
+        assert len(values) == 0
@@ -0,0 +1,127 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+shapely = pytest.importorskip("shapely")
+from shapely.geometry import box  # noqa: E402
+
+from designatedlands import PlanarizedIndex, QueryHandler  # noqa: E402
+
+
+# a single 100m x 100m tile holding two faces:
+# - west half, covered by two sources of the same designation
+# - east half, covered by one source
+TILE = "092B001"
+FACES = [
+    (
+        1,
+        ["park", "park"],
+        ["1", "2"],
+        ["Park A", "Park B"],
+        [5, 5],
+        [4, 4],
+        [3, 3],
+        5,
+        4,
+        3,
+        box(0, 0, 50, 100),
+    ),
+    (2, ["wha"], ["3"], ["WHA 1"], [2], [0], [0], 2, 0, 0, box(50, 0, 100, 100)),
+]
+
+
+class Result(list):
+    def fetchall(self):
+        return list(self)
+
+    def fetchone(self):
+        return self[0]
+
+
+class FixtureDB(object):
+    """Stand in for the database, answering the queries of PlanarizedIndex
+    """
+
+    queries = {"tile_fingerprints": "tile_fingerprints"}
+
+    def __init__(self, stored=None):
+        # content of planarized_fingerprints (None if the table does not exist)
+        self.stored = stored
+        self.computed = []
+
+    def query(self, sql, params=None):
+        if sql == "tile_fingerprints":
+            self.computed.extend(params[0])
+            return Result([(t, "fingerprint") for t in params[0] if t == TILE])
+        if "to_regclass('planarized_fingerprints')" in sql:
+            return Result([("planarized_fingerprints" if self.stored else None,)])
+        if "FROM planarized_fingerprints" in sql:
+            return Result([(t, f) for t, f in self.stored.items() if t in params[0]])
+        if "FROM tiles" in sql:
+            return Result([(TILE, box(0, 0, 100, 100).wkb)])
+        if "FROM designations_planarized" in sql:
+            return Result([face[:-1] + (face[-1].wkb,) for face in FACES])
+        raise ValueError(f"Unexpected query {sql}")
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("localhost", 0), QueryHandler)
+    server.index = PlanarizedIndex(FixtureDB())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_point(server):
+    with urllib.request.urlopen(f"{server}/point?x=25&y=50") as response:
+        records = json.loads(response.read())
+    assert len(records) == 1
+    assert records[0]["designations_planarized_id"] == 1
+    assert records[0]["source_name"] == ["Park A", "Park B"]
+
+
+def test_point_invalid(server):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(f"{server}/point?x=a")
+    assert e.value.code == 400
+
+
+def test_polygon(server):
+    geom = json.dumps(box(0, 0, 100, 100).__geo_interface__).encode("utf-8")
+    request = urllib.request.Request(f"{server}/polygon", data=geom, method="POST")
+    with urllib.request.urlopen(request) as response:
+        summary = json.loads(response.read())
+    # each face is 0.5ha, the park is counted once despite having two sources
+    assert summary["designation"] == {"park": 0.5, "wha": 0.5}
+    assert summary["forest_restriction_max"] == {"5": 0.5, "2": 0.5}
+    assert summary["mine_restriction_max"] == {"4": 0.5, "0": 0.5}
+
+
+def test_refresh_uses_stored_fingerprints():
+    db = FixtureDB(stored={TILE: "stored"})
+    index = PlanarizedIndex(db)
+    index.get_tile(TILE)
+    assert index.tiles[TILE][0] == "stored"
+    index.refresh()
+    assert TILE in index.tiles
+    # the tile is dropped when the stored fingerprint changes
+    db.stored[TILE] = "changed"
+    index.refresh()
+    assert TILE not in index.tiles
+    assert db.computed == []
+
+
+def test_refresh_computes_missing_fingerprints():
+    db = FixtureDB()
+    index = PlanarizedIndex(db)
+    index.get_tile(TILE)
+    index.refresh()
+    assert TILE in index.tiles
+    assert db.computed == [TILE, TILE]
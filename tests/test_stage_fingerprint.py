@@ -0,0 +1,160 @@
+import pytest
+
+from designatedlands import DesignatedLands
+
+
+class Result(object):
+    def __init__(self, row):
+        self.row = row
+
+    def fetchone(self):
+        return self.row
+
+
+class FixtureDB(object):
+    """
+    Stand in for the database, holding the queries, the (oid, size) of
+    tables and the recorded stage fingerprints
+    """
+
+    def __init__(self):
+        self.queries = {"tile": "SELECT 1", "normalize": "SELECT 2"}
+        self.relations = {"public.src_01": (16384, 8192)}
+        self.tables = ["public.out"]
+        self.fingerprints = {}
+
+    def query(self, sql, params):
+        if "to_regclass" in sql:
+            return Result(self.relations.get(params[0], (None, None)))
+        if "FROM stage_fingerprints" in sql:
+            fingerprint = self.fingerprints.get(params[0])
+            return Result(None if fingerprint is None else (fingerprint,))
+        raise ValueError(sql)
+
+
+@pytest.fixture
+def dl(write_config):
+    dl = DesignatedLands(write_config())
+    dl._db = FixtureDB()
+    return dl
+
+
+@pytest.fixture
+def stage(dl, tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text("a,b\n")
+    return {
+        "depends": ["download"],
+        "run": [dl.preprocess],
+        "files": [str(input_file)],
+        "tables": ["public.src_01"],
+        "sql": ["tile"],
+        "config": ["resolution"],
+        "out_tables": ["public.out"],
+        "out_files": [],
+    }
+
+
+UPSTREAM = {"download": "abc", "other": "def"}
+
+
+def test_stable(dl, stage):
+    assert dl.stage_fingerprint(stage, UPSTREAM) == dl.stage_fingerprint(
+        stage, dict(UPSTREAM)
+    )
+
+
+def test_unrelated_upstream_ignored(dl, stage):
+    fingerprint = dl.stage_fingerprint(stage, UPSTREAM)
+    assert dl.stage_fingerprint(stage, dict(UPSTREAM, other="xyz")) == fingerprint
+
+
+def changes(dl, stage):
+    """
+    Return a function reporting if the fingerprint of the stage differs from
+    its fingerprint now
+    """
+    fingerprint = dl.stage_fingerprint(stage, UPSTREAM)
+
+    def changed(upstream=UPSTREAM):
+        return dl.stage_fingerprint(stage, upstream) != fingerprint
+
+    return changed
+
+
+def test_upstream_change(dl, stage):
+    changed = changes(dl, stage)
+    assert changed(dict(UPSTREAM, download="abd"))
+
+
+def test_file_change(dl, stage):
+    changed = changes(dl, stage)
+    with open(stage["files"][0], "a") as f:
+        f.write("1,2\n")
+    assert changed()
+
+
+def test_table_reload(dl, stage):
+    changed = changes(dl, stage)
+    dl.db.relations["public.src_01"] = (16390, 8192)
+    assert changed()
+
+
+def test_table_size(dl, stage):
+    changed = changes(dl, stage)
+    dl.db.relations["public.src_01"] = (16384, 16384)
+    assert changed()
+
+
+def test_sql_change(dl, stage):
+    changed = changes(dl, stage)
+    dl.db.queries["tile"] = "SELECT 3"
+    assert changed()
+    # queries not used by the stage do not matter
+    dl.db.queries["tile"] = "SELECT 1"
+    dl.db.queries["normalize"] = "SELECT 4"
+    assert not changed()
+
+
+def test_config_change(dl, stage):
+    changed = changes(dl, stage)
+    dl.config["n_processes"] += 1
+    assert not changed()
+    dl.config["resolution"] = 20
+    assert changed()
+
+
+def test_run_change(dl, stage):
+    changed = changes(dl, stage)
+    stage["run"].append(dl.normalize)
+    assert changed()
+
+
+def test_is_current(dl, stage):
+    fingerprint = dl.stage_fingerprint(stage, UPSTREAM)
+    assert not dl.stage_is_current("preprocess", stage, fingerprint)
+    dl.db.fingerprints["preprocess"] = fingerprint
+    assert dl.stage_is_current("preprocess", stage, fingerprint)
+    assert not dl.stage_is_current("preprocess", stage, "other")
+    # outputs must exist
+    dl.db.tables = []
+    assert not dl.stage_is_current("preprocess", stage, fingerprint)
+
+
+def test_is_current_out_files(dl, stage, tmp_path):
+    fingerprint = dl.stage_fingerprint(stage, UPSTREAM)
+    dl.db.fingerprints["preprocess"] = fingerprint
+    stage["out_files"] = [tmp_path / "out.tif"]
+    assert not dl.stage_is_current("preprocess", stage, fingerprint)
+    stage["out_files"][0].write_bytes(b"")
+    assert dl.stage_is_current("preprocess", stage, fingerprint)
+
+
+def test_download_stage_inputs(dl):
+    # downloads are reused until the source csvs or dl_path change
+    download = dl.stages()["download"]
+    assert download["files"] == [
+        dl.config["sources_designations"],
+        dl.config["sources_supporting"],
+    ]
+    assert download["config"] == ["dl_path"]
@@ -0,0 +1,68 @@
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+fiona = pytest.importorskip("fiona")
+import numpy as np  # noqa: E402
+from affine import Affine  # noqa: E402
+from shapely.geometry import box, mapping  # noqa: E402
+
+from designatedlands import bounds_window, zonal_areas  # noqa: E402
+
+
+# 10 x 10 grid of 10m cells
+TRANSFORM = Affine(10, 0, 1000000, 0, -10, 500100)
+
+
+def test_bounds_window_covers_edge_cells():
+    # columns 0.8 to 2.6 touch cells 0, 1 and 2
+    window = bounds_window((1000008, 500000, 1000026, 500100), TRANSFORM, 10, 10)
+    assert (window.col_off, window.width) == (0, 3)
+    assert (window.row_off, window.height) == (0, 10)
+
+
+def test_bounds_window_clipped():
+    window = bounds_window((999950, 500050, 1000015, 500200), TRANSFORM, 10, 10)
+    assert (window.col_off, window.row_off, window.width, window.height) == (
+        0,
+        0,
+        2,
+        5,
+    )
+    assert bounds_window((900000, 400000, 900100, 400100), TRANSFORM, 10, 10) is None
+
+
+def test_zonal_areas(tmp_path):
+    raster = str(tmp_path / "designatedlands.tif")
+    array = np.ones((10, 10), dtype="uint8")
+    array[:, 2] = 2
+    with rasterio.open(
+        raster,
+        "w",
+        driver="GTiff",
+        dtype="uint8",
+        count=1,
+        width=10,
+        height=10,
+        crs="EPSG:3005",
+        transform=TRANSFORM,
+        nodata=255,
+    ) as dst:
+        dst.write(array, 1)
+    layer = str(tmp_path / "features.gpkg")
+    schema = {"geometry": "Polygon", "properties": {"id": "int"}}
+    with fiona.open(
+        layer, "w", driver="GPKG", crs="EPSG:3005", schema=schema, layer="features"
+    ) as dst:
+        # covers the centres of columns 1 and 2 - column 2 is only reached by
+        # extending the window to the end of the feature's bounds
+        dst.write(
+            {
+                "geometry": mapping(box(1000008, 500000, 1000026, 500100)),
+                "properties": {"id": 7},
+            }
+        )
+    rows = zonal_areas({"designatedlands": raster}, layer, "features", "id", (0, 1))
+    assert sorted(rows) == [
+        (7, "designatedlands", 1, pytest.approx(0.1)),
+        (7, "designatedlands", 2, pytest.approx(0.1)),
+    ]